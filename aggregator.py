@@ -0,0 +1,230 @@
+"""
+Сведение нескольких отчётов HTM в один файл .01.
+
+Каждая ячейка (строка, графа) результата - свёртка значений всех отчётов
+(сумма, последнее, максимум или минимум). Отчёты разбираются параллельно,
+в памяти держится только разреженный накопитель и ограниченное окно
+ещё не свёрнутых отчётов.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from parser import parse_htm
+from typing import Callable, Dict, Iterable, Tuple, Union
+
+from processor import apply_values, load_file_01, save_file_01
+
+# Стандартные функции свёртки: (накопленное, новое) -> результат
+REDUCERS = {
+    "sum": lambda acc, value: acc + value,
+    "last": lambda acc, value: value,
+    "max": max,
+    "min": min,
+}
+
+
+def parse_report(htm_path: str) -> Dict[Tuple[int, int], float]:
+    """
+    Разбирает один отчёт в словарь {(строка, графа): значение}.
+
+    Внутри одного отчёта повторная ячейка перезаписывается, как в apply_values.
+    Выполняется в рабочем процессе, поэтому функция модульного уровня.
+    """
+    cells = {}
+    for entry in parse_htm(htm_path):
+        cells[(entry["row"], entry["column"])] = entry["value"]
+    return cells
+
+
+def _iter_reports(htm_paths: Iterable[str], workers: int):
+    """
+    Отдаёт (путь, ячейки или исключение) в порядке входных путей.
+
+    Одновременно в работе не больше workers * 2 отчётов, поэтому память
+    не растёт с числом входов.
+    """
+    if workers <= 1:
+        for path in htm_paths:
+            try:
+                yield path, parse_report(path)
+            except Exception as e:
+                yield path, e
+        return
+
+    window = workers * 2
+    pending = deque()
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        for path in htm_paths:
+            try:
+                future = executor.submit(parse_report, path)
+            except BrokenProcessPool:
+                # Пул сломан упавшим рабочим процессом: дожидаемся ожидающих
+                # отчётов и продолжаем в новом пуле
+                while pending:
+                    yield _take_result(*pending.popleft())
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                future = executor.submit(parse_report, path)
+
+            pending.append((path, future))
+            if len(pending) >= window:
+                yield _take_result(*pending.popleft())
+
+        while pending:
+            yield _take_result(*pending.popleft())
+    finally:
+        executor.shutdown()
+
+
+def _take_result(path: str, future):
+    """
+    Возвращает (путь, ячейки или исключение) для завершённой задачи.
+
+    Если рабочий процесс упал (например, не хватило памяти на огромный
+    отчёт), пул ломается и все его задачи завершаются BrokenProcessPool.
+    Такой отчёт повторно разбирается в отдельном процессе: исправные отчёты
+    будут сведены, ошибкой отметится только тот, что роняет процесс.
+    """
+    error = future.exception()
+    if error is None:
+        return path, future.result()
+    if not isinstance(error, BrokenProcessPool):
+        return path, error
+
+    with ProcessPoolExecutor(max_workers=1) as isolated:
+        retry = isolated.submit(parse_report, path)
+        return path, retry.exception() or retry.result()
+
+
+def aggregate(
+    htm_paths: Iterable[str],
+    template: str,
+    reducer: Union[str, Callable[[float, float], float]] = "sum",
+    output_path: str = None,
+    workers: int = None,
+) -> Dict:
+    """
+    Сводит значения из множества HTM в один файл .01.
+
+    Args:
+        htm_paths: Пути к HTM файлам (можно передать генератор)
+        template: Путь к шаблону .01
+        reducer: "sum", "last", "max", "min" или функция (накопленное, новое) -> значение
+        output_path: Путь для сохранения результата (если None, генерируется автоматически)
+        workers: Число процессов разбора (None - по числу CPU, 1 - без пула)
+
+    Returns:
+        Словарь со статистикой:
+        {
+            "report_count": int,
+            "failed_count": int,
+            "cell_count": int,
+            "applied_count": int,
+            "skipped_count": int,
+            "output_path": str,
+            "errors": list
+        }
+    """
+    if isinstance(reducer, str):
+        if reducer not in REDUCERS:
+            raise ValueError(
+                f"Неизвестная свёртка: {reducer} (допустимо: {', '.join(REDUCERS)})"
+            )
+        reduce_fn = REDUCERS[reducer]
+    else:
+        reduce_fn = reducer
+
+    if output_path is None:
+        base, ext = os.path.splitext(template)
+        output_path = f"{base}_result{ext}"
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Загружаем шаблон до разбора: ошибка в пути не должна
+    # обнаруживаться после прохода по всем отчётам
+    headers, data = load_file_01(template)
+
+    # Разреженный накопитель {(строка, графа): значение}
+    accumulator = {}
+    reports = 0
+    failed = 0
+    errors = []
+
+    for path, cells in _iter_reports(htm_paths, workers):
+        if isinstance(cells, Exception):
+            errors.append(f"{path}: {cells}")
+            failed += 1
+            continue
+
+        reports += 1
+        for key, value in cells.items():
+            if key in accumulator:
+                accumulator[key] = reduce_fn(accumulator[key], value)
+            else:
+                accumulator[key] = value
+
+    # Записываем шаблон один раз
+    values = [
+        {"row": row, "column": column, "value": accumulator[(row, column)]}
+        for row, column in sorted(accumulator)
+    ]
+    applied, skipped, apply_errors = apply_values(data, values)
+    errors.extend(apply_errors)
+    save_file_01(output_path, headers, data)
+
+    return {
+        "report_count": reports,
+        "failed_count": failed,
+        "cell_count": len(accumulator),
+        "applied_count": applied,
+        "skipped_count": skipped,
+        "output_path": output_path,
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    arg_parser = argparse.ArgumentParser(
+        description="Сведение нескольких HTM в один файл .01"
+    )
+    arg_parser.add_argument("template", help="Шаблон .01")
+    arg_parser.add_argument("htm", nargs="+", help="Файлы HTM")
+    arg_parser.add_argument(
+        "--reducer", default="sum", choices=sorted(REDUCERS), help="Функция свёртки"
+    )
+    arg_parser.add_argument("--output", help="Путь результата")
+    arg_parser.add_argument("--workers", type=int, help="Число процессов разбора")
+    args = arg_parser.parse_args()
+
+    try:
+        result = aggregate(
+            args.htm,
+            args.template,
+            reducer=args.reducer,
+            output_path=args.output,
+            workers=args.workers,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}")
+        sys.exit(2)
+
+    print(f"Сведение завершено:")
+    print(f"  Отчётов обработано: {result['report_count']}")
+    print(f"  Отчётов с ошибкой: {result['failed_count']}")
+    print(f"  Ячеек в сводке: {result['cell_count']}")
+    print(f"  Применено: {result['applied_count']}")
+    print(f"  Пропущено: {result['skipped_count']}")
+    print(f"  Результат сохранён: {result['output_path']}")
+
+    if result["errors"]:
+        print(f"  Ошибки:")
+        for err in result["errors"][:10]:
+            print(f"    - {err}")
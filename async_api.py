@@ -0,0 +1,173 @@
+"""
+Асинхронный интерфейс обработки для asyncio-сервисов.
+
+Чтение HTM и выделение блоков выполняются в пуле потоков по умолчанию,
+разбор блоков и заполнение .01 - в переданном исполнителе (ThreadPoolExecutor
+или ProcessPoolExecutor), разбор - порциями блоков. Между порциями проверяется
+отмена, поэтому отменённый запрос освобождает исполнитель не позже, чем через
+одну порцию.
+"""
+
+import asyncio
+import os
+import weakref
+from concurrent.futures import Executor
+from parser import parse_block, read_htm, split_comparison_blocks
+from typing import AsyncIterator, Dict, List, Optional
+
+from processor import apply_values, load_file_01, save_file_01
+
+# Число блоков "Сравнение", разбираемых за одно обращение к исполнителю
+BLOCK_CHUNK = 64
+
+# Семафоры по умолчанию - свой для каждого цикла событий
+_default_semaphores = weakref.WeakKeyDictionary()
+
+
+def _default_semaphore() -> asyncio.Semaphore:
+    """Семафор по умолчанию: не больше os.cpu_count() одновременных обработок."""
+    loop = asyncio.get_running_loop()
+    semaphore = _default_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+        _default_semaphores[loop] = semaphore
+    return semaphore
+
+
+def _parse_blocks(blocks: List[str]) -> List[Dict]:
+    """Разбирает порцию блоков (выполняется в исполнителе)."""
+    results = []
+    for td_block in blocks:
+        results.extend(parse_block(td_block))
+    return results
+
+
+def _read_blocks(htm_path: str) -> List[str]:
+    """
+    Читает HTM и выделяет блоки "Сравнение" (выполняется в пуле потоков).
+
+    Содержимое файла не передаётся в исполнитель разбора: в процессный
+    пул уходят только порции блоков.
+    """
+    return split_comparison_blocks(read_htm(htm_path))
+
+
+def _fill_file(file_01_path: str, values: List[Dict], output_path: str):
+    """
+    Загружает .01, применяет значения и сохраняет результат.
+
+    Выполняется в исполнителе целиком, чтобы данные файла не передавались
+    между процессами - туда уходят только значения, обратно статистика.
+    """
+    headers, data = load_file_01(file_01_path)
+    changed = set()
+    applied, skipped, errors = apply_values(data, values, changed)
+    save_file_01(output_path, headers, data)
+    return applied, skipped, errors, changed
+
+
+async def _iter_entries(
+    htm_path: str, executor: Optional[Executor], chunk_size: int
+) -> AsyncIterator[Dict]:
+    """iter_entries_async без семафора (вызывающий уже держит его)."""
+    loop = asyncio.get_running_loop()
+
+    # Отмена во время чтения и выделения блоков прерывает ожидание сразу,
+    # но поток пула завершит этот шаг сам; дальнейшие порции не запускаются
+    blocks = await loop.run_in_executor(None, _read_blocks, htm_path)
+
+    for i in range(0, len(blocks), chunk_size):
+        entries = await loop.run_in_executor(
+            executor, _parse_blocks, blocks[i : i + chunk_size]
+        )
+        for entry in entries:
+            yield entry
+
+
+async def iter_entries_async(
+    htm_path: str,
+    executor: Optional[Executor] = None,
+    chunk_size: int = BLOCK_CHUNK,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Асинхронно перебирает записи из HTM файла.
+
+    Семафор удерживается, пока перебор не закончится или не будет прерван.
+
+    Args:
+        htm_path: Путь к HTM файлу
+        executor: Исполнитель для разбора (None - пул потоков по умолчанию)
+        chunk_size: Число блоков "Сравнение" в одной порции разбора
+        semaphore: Ограничение числа одновременных обработок
+            (None - общий семафор, как у process_async)
+
+    Yields:
+        {"row": int, "column": int, "value": float}
+    """
+    async with semaphore or _default_semaphore():
+        async for entry in _iter_entries(htm_path, executor, chunk_size):
+            yield entry
+
+
+async def process_async(
+    htm_path: str,
+    file_01_path: str,
+    output_path: str = None,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Dict:
+    """
+    Асинхронный аналог processor.process.
+
+    Args:
+        htm_path: Путь к HTM файлу
+        file_01_path: Путь к файлу .01
+        output_path: Путь для сохранения результата (если None, генерируется автоматически)
+        executor: Исполнитель для разбора HTM и заполнения .01
+            (None - пул потоков по умолчанию)
+        semaphore: Ограничение числа одновременных обработок
+            (None - общий семафор на os.cpu_count() обработок)
+
+    Returns:
+        Словарь со статистикой, как у processor.process
+    """
+    if output_path is None:
+        base, ext = os.path.splitext(file_01_path)
+        output_path = f"{base}_result{ext}"
+
+    loop = asyncio.get_running_loop()
+
+    async with semaphore or _default_semaphore():
+        # Парсим HTM
+        values = [
+            entry async for entry in _iter_entries(htm_path, executor, BLOCK_CHUNK)
+        ]
+
+        # Загружаем .01, применяем значения и сохраняем результат
+        applied, skipped, errors, changed = await loop.run_in_executor(
+            executor, _fill_file, file_01_path, values, output_path
+        )
+
+    return {
+        "parsed_count": len(values),
+        "applied_count": applied,
+        "skipped_count": skipped,
+        "output_path": output_path,
+        "changed_cells": changed,
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Тест на примере файлов
+    htm_path = sys.argv[1] if len(sys.argv) > 1 else "dist/input.HTM"
+    file_01_path = sys.argv[2] if len(sys.argv) > 2 else "dist/412.01"
+
+    result = asyncio.run(process_async(htm_path, file_01_path))
+    print(f"Обработка завершена:")
+    print(f"  Найдено записей в HTM: {result['parsed_count']}")
+    print(f"  Применено: {result['applied_count']}")
+    print(f"  Результат сохранён: {result['output_path']}")
@@ -0,0 +1,367 @@
+"""
+Пакетная обработка пар HTM + .01 с журналом контрольных точек.
+
+Состояние каждого задания дописывается в журнал (JSON по строке на запись)
+вместе с хешами входных файлов и путём результата. Прерванный запуск можно
+продолжить с флагом --resume: готовые задания с неизменившимися входами
+пропускаются, повторно выполняются только упавшие и незавершённые.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from processor import process
+
+# Состояния задания в журнале
+STATE_STARTED = "started"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+# Ошибки, которые могут пройти при повторе (сбой диска или сети, нехватка памяти).
+# Ошибки в данных (кодировка, формат .01) повторять бессмысленно
+RETRYABLE_ERRORS = (OSError, MemoryError)
+
+# Отсутствие файла повтором не исправить, хотя это тоже OSError
+NON_RETRYABLE_ERRORS = (FileNotFoundError,)
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Вычисляет SHA-256 файла, читая его блоками.
+
+    Args:
+        file_path: Путь к файлу
+
+    Returns:
+        Хеш в виде hex-строки
+    """
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Journal:
+    """
+    Журнал состояний заданий (только дозапись).
+
+    Записи сбрасываются на диск (fsync) каждые sync_every записей
+    или не реже, чем раз в sync_interval секунд.
+    """
+
+    def __init__(self, path: str, sync_every: int = 50, sync_interval: float = 5.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Читает журнал и возвращает последнюю запись по каждому заданию.
+
+        Недописанная последняя строка (обрыв питания) пропускается.
+
+        Returns:
+            {ключ_задания: запись}
+        """
+        states = {}
+        if not os.path.exists(self.path):
+            return states
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if "job" in record:
+                    states[record["job"]] = record
+
+        return states
+
+    def record(self, job: str, state: str, **fields):
+        """Дописывает запись о состоянии задания."""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+        record = {"job": job, "state": state, "time": time.time()}
+        record.update(fields)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._pending += 1
+
+        if (
+            self._pending >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self):
+        """Сбрасывает накопленные записи на диск."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Сбрасывает записи на диск и закрывает журнал."""
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_jobs(list_path: str) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Читает список заданий.
+
+    Формат строки: "путь_к_htm;путь_к_01[;путь_результата]".
+    Пустые строки и строки, начинающиеся с "#", пропускаются.
+    Относительные пути считаются от папки файла со списком.
+
+    Args:
+        list_path: Путь к файлу со списком заданий
+
+    Returns:
+        [(htm_path, file_01_path, output_path или None), ...]
+    """
+    base_dir = os.path.dirname(os.path.abspath(list_path))
+    jobs = []
+
+    with open(list_path, "r", encoding="utf-8") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            parts = [p.strip() for p in line.split(";")]
+            if len(parts) not in (2, 3):
+                raise ValueError(
+                    f"Строка {line_num}: ожидается 'htm;01[;результат]', получено: {line}"
+                )
+
+            if not parts[0] or not parts[1]:
+                raise ValueError(
+                    f"Строка {line_num}: не указан путь к htm или .01: {line}"
+                )
+
+            paths = [os.path.join(base_dir, p) if p else None for p in parts]
+            if len(paths) == 2:
+                paths.append(None)
+            jobs.append(tuple(paths))
+
+    return jobs
+
+
+def default_output_path(file_01_path: str) -> str:
+    """Путь результата по умолчанию - как в process()."""
+    base, ext = os.path.splitext(file_01_path)
+    return f"{base}_result{ext}"
+
+
+def is_complete(record: Optional[Dict], htm_hash: str, file_01_hash: str) -> bool:
+    """
+    Проверяет, что задание уже выполнено и его можно пропустить.
+
+    Задание считается готовым, если последняя запись в журнале - "done",
+    хеши входных файлов не изменились, а результат существует и имеет
+    записанный размер (результат пишется атомарно, поэтому
+    недописанного файла быть не может).
+    """
+    if not record or record.get("state") != STATE_DONE:
+        return False
+    if record.get("htm_hash") != htm_hash or record.get("file_01_hash") != file_01_hash:
+        return False
+
+    output_path = record.get("output_path")
+    if not output_path or not os.path.exists(output_path):
+        return False
+    return os.path.getsize(output_path) == record.get("output_size")
+
+
+def run_batch(
+    jobs: List[Tuple[str, str, Optional[str]]],
+    journal_path: str,
+    resume: bool = False,
+    retries: int = 2,
+    retry_delay: float = 1.0,
+    backoff: float = 2.0,
+    sync_every: int = 50,
+    sync_interval: float = 5.0,
+    retry_on: Tuple[type, ...] = RETRYABLE_ERRORS,
+) -> Dict:
+    """
+    Выполняет пакет заданий с записью состояний в журнал.
+
+    Args:
+        jobs: Список заданий [(htm_path, file_01_path, output_path), ...]
+        journal_path: Путь к журналу
+        resume: Пропускать задания, уже выполненные в предыдущих запусках
+        retries: Число повторов упавшего задания
+        retry_delay: Пауза перед первым повтором, секунды
+        backoff: Множитель паузы для каждого следующего повтора
+        sync_every: Сбрасывать журнал на диск каждые N записей
+        sync_interval: Сбрасывать журнал на диск не реже, чем раз в N секунд
+        retry_on: Типы исключений, при которых задание повторяется;
+            остальные ошибки сразу отмечают задание упавшим
+
+    Returns:
+        Словарь со статистикой:
+        {
+            "total": int,
+            "done_count": int,
+            "skipped_count": int,
+            "failed_count": int,
+            "errors": list
+        }
+    """
+    done = 0
+    skipped = 0
+    failed = 0
+    errors = []
+
+    journal = Journal(journal_path, sync_every=sync_every, sync_interval=sync_interval)
+    previous = journal.load() if resume else {}
+
+    with journal:
+        for htm_path, file_01_path, output_path in jobs:
+            if output_path is None:
+                output_path = default_output_path(file_01_path)
+            job = os.path.abspath(output_path)
+
+            try:
+                htm_hash = file_hash(htm_path)
+                file_01_hash = file_hash(file_01_path)
+            except OSError as e:
+                journal.record(job, STATE_FAILED, error=str(e))
+                errors.append(f"{job}: {e}")
+                failed += 1
+                continue
+
+            if resume and is_complete(previous.get(job), htm_hash, file_01_hash):
+                skipped += 1
+                continue
+
+            hashes = {"htm_hash": htm_hash, "file_01_hash": file_01_hash}
+            delay = retry_delay
+
+            for attempt in range(1, retries + 2):
+                journal.record(job, STATE_STARTED, attempt=attempt, **hashes)
+                try:
+                    result = process(htm_path, file_01_path, output_path)
+                except Exception as e:
+                    journal.record(job, STATE_FAILED, attempt=attempt, error=str(e), **hashes)
+                    retryable = isinstance(e, retry_on) and not isinstance(
+                        e, NON_RETRYABLE_ERRORS
+                    )
+                    if not retryable or attempt > retries:
+                        errors.append(f"{job}: {e}")
+                        failed += 1
+                        break
+                    time.sleep(delay)
+                    delay *= backoff
+                    continue
+
+                journal.record(
+                    job,
+                    STATE_DONE,
+                    attempt=attempt,
+                    output_path=result["output_path"],
+                    output_size=os.path.getsize(result["output_path"]),
+                    applied_count=result["applied_count"],
+                    skipped_count=result["skipped_count"],
+                    **hashes,
+                )
+                done += 1
+                break
+
+    return {
+        "total": len(jobs),
+        "done_count": done,
+        "skipped_count": skipped,
+        "failed_count": failed,
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    arg_parser = argparse.ArgumentParser(
+        description="Пакетная обработка пар HTM + .01 с журналом"
+    )
+    arg_parser.add_argument("jobs", help="Файл со списком заданий (htm;01[;результат])")
+    arg_parser.add_argument(
+        "--journal", help="Путь к журналу (по умолчанию <jobs>.journal)"
+    )
+    arg_parser.add_argument(
+        "--resume", action="store_true", help="Продолжить прерванный запуск"
+    )
+    arg_parser.add_argument(
+        "--retries", type=int, default=2, help="Число повторов упавшего задания"
+    )
+    arg_parser.add_argument(
+        "--retry-delay", type=float, default=1.0, help="Пауза перед повтором, секунды"
+    )
+    arg_parser.add_argument(
+        "--backoff", type=float, default=2.0, help="Множитель паузы между повторами"
+    )
+    arg_parser.add_argument(
+        "--sync-every", type=int, default=50, help="fsync журнала каждые N записей"
+    )
+    arg_parser.add_argument(
+        "--sync-interval",
+        type=float,
+        default=5.0,
+        help="fsync журнала не реже, чем раз в N секунд",
+    )
+    args = arg_parser.parse_args()
+
+    journal_path = args.journal or args.jobs + ".journal"
+
+    try:
+        result = run_batch(
+            load_jobs(args.jobs),
+            journal_path,
+            resume=args.resume,
+            retries=args.retries,
+            retry_delay=args.retry_delay,
+            backoff=args.backoff,
+            sync_every=args.sync_every,
+            sync_interval=args.sync_interval,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}")
+        sys.exit(2)
+
+    print(f"Пакетная обработка завершена:")
+    print(f"  Всего заданий: {result['total']}")
+    print(f"  Выполнено: {result['done_count']}")
+    print(f"  Пропущено (уже готовы): {result['skipped_count']}")
+    print(f"  С ошибкой: {result['failed_count']}")
+    print(f"  Журнал: {journal_path}")
+
+    if result["errors"]:
+        print(f"  Ошибки:")
+        for err in result["errors"][:10]:
+            print(f"    - {err}")
+
+    sys.exit(1 if result["failed_count"] else 0)
@@ -0,0 +1,192 @@
+"""
+Потоковая обработка через stdin/stdout для конвейеров командной строки.
+
+    python htm.py parse [report.htm]      HTM (файл или stdin) -> записи NDJSON в stdout
+    python htm.py fill tmpl.01 [entries]  записи NDJSON (файл или stdin) -> .01 в stdout
+    python htm.py self-check [htm] [01]   сверка потокового режима с обычной обработкой
+
+Пример без промежуточных файлов:
+
+    zcat report.htm.gz | python htm.py parse | python htm.py fill tmpl.01 > out.01
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+from parser import iter_htm_stream, parse_htm_content, read_htm
+from typing import BinaryIO, Dict, Iterator, List
+
+from processor import apply_values, fill_stream, load_file_01, save_file_01
+
+# Размеры блоков чтения для самопроверки потокового разбора
+SELF_CHECK_CHUNK_SIZES = (1, 2, 3, 5, 7, 64, 1000, 4096, 65536)
+
+
+def write_entries(stream: BinaryIO, out) -> int:
+    """
+    Разбирает HTM из потока и пишет записи в out по строке JSON на запись.
+
+    Returns:
+        Число записей
+    """
+    count = 0
+    for entry in iter_htm_stream(stream):
+        out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def read_entries(stream: BinaryIO) -> Iterator[Dict]:
+    """
+    Читает записи NDJSON из бинарного потока.
+
+    Значения приводятся к числам, так что {"row": "1", ...} тоже принимается.
+
+    Raises:
+        ValueError: Если строка не является записью {"row", "column", "value"}
+    """
+    for line_num, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line.decode("utf-8"))
+            if any(isinstance(raw[key], bool) for key in ("row", "column", "value")):
+                raise TypeError("ожидается число, а не true/false")
+            value = raw["value"]
+            # Целые из JSON оставляем целыми, чтобы не терять точность
+            if not isinstance(value, (int, float)):
+                value = float(value)
+            entry = {
+                "row": int(raw["row"]),
+                "column": int(raw["column"]),
+                "value": value,
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Строка {line_num}: некорректная запись ({e})")
+
+        yield entry
+
+
+def open_input(path: str) -> BinaryIO:
+    """Открывает файл для чтения или возвращает stdin для "-"."""
+    if path == "-":
+        return sys.stdin.buffer
+    return open(path, "rb")
+
+
+def self_check(htm_path: str, file_01_path: str) -> List[str]:
+    """
+    Сверяет потоковые функции с обычными на паре файлов.
+
+    - iter_htm_stream при разных размерах блока = parse_htm_content
+    - fill_stream = load_file_01 + apply_values + save_file_01
+
+    Returns:
+        Список найденных расхождений (пустой, если всё совпадает)
+    """
+    problems = []
+
+    expected = parse_htm_content(read_htm(htm_path))
+    with open(htm_path, "rb") as f:
+        raw = f.read()
+    for chunk_size in SELF_CHECK_CHUNK_SIZES:
+        streamed = list(iter_htm_stream(io.BytesIO(raw), chunk_size))
+        if streamed != expected:
+            problems.append(
+                f"iter_htm_stream (блок {chunk_size}): {len(streamed)} записей "
+                f"вместо {len(expected)} или другие значения"
+            )
+
+    headers, data = load_file_01(file_01_path)
+    apply_values(data, expected)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        saved_path = os.path.join(tmp_dir, "result.01")
+        save_file_01(saved_path, headers, data)
+        with open(saved_path, "r", encoding="utf-8") as f:
+            saved = f.read()
+
+    filled = io.StringIO()
+    with open(file_01_path, "r", encoding="utf-8") as template:
+        fill_stream(template, expected, filled)
+    if filled.getvalue() != saved:
+        problems.append("fill_stream: результат отличается от save_file_01")
+
+    return problems
+
+
+def cmd_self_check(args) -> int:
+    problems = self_check(args.htm, args.file_01)
+    for problem in problems:
+        print(f"  - {problem}", file=sys.stderr)
+    print("Самопроверка: " + ("ошибки" if problems else "OK"), file=sys.stderr)
+    return 1 if problems else 0
+
+
+def cmd_parse(args) -> int:
+    with open_input(args.htm) as stream:
+        count = write_entries(stream, sys.stdout)
+    sys.stdout.flush()
+    print(f"Найдено записей: {count}", file=sys.stderr)
+    return 0
+
+
+def cmd_fill(args) -> int:
+    with open_input(args.entries) as stream, open(
+        args.template, "r", encoding="utf-8"
+    ) as template:
+        applied, skipped, errors = fill_stream(
+            template, read_entries(stream), sys.stdout
+        )
+    sys.stdout.flush()
+
+    print(f"Применено: {applied}, пропущено: {skipped}", file=sys.stderr)
+    for err in errors[:10]:
+        print(f"  - {err}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description="Потоковая обработка HTM и .01 через stdin/stdout"
+    )
+    commands = arg_parser.add_subparsers(dest="command")
+    commands.required = True
+
+    parse_cmd = commands.add_parser("parse", help="HTM -> записи NDJSON")
+    parse_cmd.add_argument(
+        "htm", nargs="?", default="-", help="Файл HTM (по умолчанию stdin)"
+    )
+    parse_cmd.set_defaults(func=cmd_parse)
+
+    fill_cmd = commands.add_parser("fill", help="Записи NDJSON + шаблон -> .01")
+    fill_cmd.add_argument("template", help="Шаблон .01")
+    fill_cmd.add_argument(
+        "entries", nargs="?", default="-", help="Файл NDJSON (по умолчанию stdin)"
+    )
+    fill_cmd.set_defaults(func=cmd_fill)
+
+    check_cmd = commands.add_parser(
+        "self-check", help="Сверить потоковый режим с обычной обработкой"
+    )
+    check_cmd.add_argument("htm", nargs="?", default="dist/input.HTM", help="Файл HTM")
+    check_cmd.add_argument("file_01", nargs="?", default="dist/412.01", help="Файл .01")
+    check_cmd.set_defaults(func=cmd_self_check)
+
+    args = arg_parser.parse_args(argv)
+
+    # .01 и NDJSON пишутся в UTF-8 независимо от кодировки консоли
+    sys.stdout.reconfigure(encoding="utf-8")
+
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
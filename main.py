@@ -4,6 +4,7 @@ GUI приложение для обработки HTM файлов и запи
 """
 
 import os
+import queue
 import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
@@ -16,22 +17,38 @@ try:
 except ImportError:
     HAS_DND = False
 
+from preview import ResultPreview
 from processor import process
+from single_instance import InstanceServer, send_to_running_instance
+
+# Интервал опроса очереди файлов от других запусков, мс
+INCOMING_POLL_MS = 200
 
 
 class Application:
-    def __init__(self, root):
+    def __init__(self, root, incoming=None):
         self.root = root
         self.root.title("Обработка отчётов HTM -> .01")
-        self.root.geometry("500x450")
+        self.root.geometry("500x500")
         self.root.resizable(True, True)
 
         # Пути к файлам
         self.htm_path = tk.StringVar()
         self.file_01_path = tk.StringVar()
 
+        # Результат последней обработки (для просмотра)
+        self.last_result = None
+
+        # Открытые окна просмотра, обновляются после новой обработки
+        self.previews = []
+
         self.create_widgets()
 
+        # Очередь файлов, переданных последующими запусками программы
+        self.incoming = incoming
+        if self.incoming is not None:
+            self.root.after(INCOMING_POLL_MS, self.poll_incoming)
+
     def create_widgets(self):
         # Основной контейнер
         main_frame = ttk.Frame(self.root, padding="10")
@@ -97,7 +114,16 @@ class Application:
             command=self.run_processing,
             state=tk.DISABLED,
         )
-        self.process_btn.pack(pady=10, ipadx=20, ipady=5)
+        self.process_btn.pack(pady=(10, 5), ipadx=20, ipady=5)
+
+        # Кнопка просмотра результата
+        self.preview_btn = ttk.Button(
+            main_frame,
+            text="Просмотр результата",
+            command=self.open_preview,
+            state=tk.DISABLED,
+        )
+        self.preview_btn.pack(pady=(0, 10))
 
         # Область результатов
         result_frame = ttk.LabelFrame(main_frame, text="Результат", padding="10")
@@ -192,6 +218,30 @@ class Application:
             self.file_01_path.set(file_path)
             self.file_01_status.config(text="OK", foreground="green")
 
+    def add_files(self, files):
+        """Добавляет несколько файлов (из командной строки или другого запуска)"""
+        for file_path in files:
+            self.add_file(file_path)
+        self.update_status()
+
+    def poll_incoming(self):
+        """Забирает файлы, переданные другими запусками, и поднимает окно"""
+        received = False
+        while True:
+            try:
+                files = self.incoming.get_nowait()
+            except queue.Empty:
+                break
+            self.add_files(files)
+            received = True
+
+        if received:
+            self.root.deiconify()
+            self.root.lift()
+            self.root.focus_force()
+
+        self.root.after(INCOMING_POLL_MS, self.poll_incoming)
+
     def select_htm(self):
         """Диалог выбора HTM файла"""
         file_path = filedialog.askopenfilename(
@@ -230,6 +280,8 @@ class Application:
 
     def clear_result(self):
         """Очищает область результатов"""
+        self.last_result = None
+        self.preview_btn.config(state=tk.DISABLED)
         self.result_text.config(state=tk.NORMAL)
         self.result_text.delete(1.0, tk.END)
         self.result_text.config(state=tk.DISABLED)
@@ -265,6 +317,9 @@ class Application:
 
         try:
             result = process(htm_path, file_01_path)
+            self.last_result = result
+            self.preview_btn.config(state=tk.NORMAL)
+            self.reload_previews(result)
 
             self.log("")
             self.log(f"Найдено записей в HTM: {result['parsed_count']}")
@@ -290,16 +345,61 @@ class Application:
             self.log(f"ОШИБКА: {e}")
             messagebox.showerror("Ошибка", f"Произошла ошибка:\n{e}")
 
+    def open_preview(self):
+        """Открывает окно просмотра результата"""
+        if not self.last_result:
+            return
+
+        output_path = self.last_result["output_path"]
+        window = tk.Toplevel(self.root)
+        window.title(f"Просмотр: {os.path.basename(output_path)}")
+        window.geometry("800x500")
+
+        try:
+            preview = ResultPreview(
+                window, output_path, self.last_result["changed_cells"]
+            )
+        except OSError as e:
+            window.destroy()
+            messagebox.showerror("Ошибка", f"Не удалось открыть результат:\n{e}")
+            return
+
+        preview.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.previews.append(preview)
+
+    def reload_previews(self, result):
+        """Перечитывает открытые окна просмотра того же файла результата"""
+        self.previews = [p for p in self.previews if p.winfo_exists()]
+        output_path = os.path.abspath(result["output_path"])
+        for preview in self.previews:
+            if os.path.abspath(preview.index.file_path) == output_path:
+                preview.reload(result["changed_cells"])
+
 
 def main():
+    # Файлы из "Открыть с помощью" / перетаскивания на значок
+    files = sys.argv[1:]
+
+    # Если программа уже запущена - передаём ей файлы и выходим без окна
+    if send_to_running_instance(files):
+        return
+
+    server = InstanceServer()
+    incoming = server.queue if server.start() else None
+
     # Создаём окно с поддержкой DnD если доступно
     if HAS_DND:
         root = TkinterDnD.Tk()
     else:
         root = tk.Tk()
 
-    app = Application(root)
-    root.mainloop()
+    app = Application(root, incoming)
+    app.add_files(files)
+
+    try:
+        root.mainloop()
+    finally:
+        server.close()
 
 
 if __name__ == "__main__":
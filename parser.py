@@ -2,70 +2,188 @@
 Парсер HTM файлов с извлечением данных из секций "Сравнение".
 """
 
+import codecs
 import re
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 from calculator import evaluate
 
 
-def parse_htm(file_path: str) -> List[Dict]:
+def parse_htm(file_path: str, with_current: bool = False) -> List[Dict]:
     """
     Парсит HTM файл и извлекает данные из секций "Сравнение".
 
     Args:
         file_path: Путь к HTM файлу
+        with_current: Добавлять в записи левую часть сравнения "current"
+            (нужна только для проверки, поэтому по умолчанию не вычисляется)
 
     Returns:
         Список словарей с данными:
         [{"row": int, "column": int, "value": float}, ...]
+        с with_current - ещё "current": float или None
     """
-    # Читаем файл в кодировке windows-1251
+    return parse_htm_content(read_htm(file_path), with_current)
+
+
+def read_htm(file_path: str) -> str:
+    """Читает HTM файл в кодировке windows-1251."""
     with open(file_path, "r", encoding="windows-1251") as f:
-        content = f.read()
+        return f.read()
 
-    # Заменяем HTML-сущности
-    content = content.replace("&lt;", "<").replace("&gt;", ">")
 
+def parse_htm_content(content: str, with_current: bool = False) -> List[Dict]:
+    """
+    Извлекает данные из секций "Сравнение" уже прочитанного HTM.
+
+    Args:
+        content: Содержимое HTM файла
+        with_current: Добавлять в записи левую часть сравнения (см. parse_htm)
+
+    Returns:
+        Список словарей с данными (см. parse_htm)
+    """
     results = []
+    for td_block in split_comparison_blocks(content):
+        results.extend(parse_block(td_block, with_current))
+    return results
+
+
+def iter_htm_stream(stream: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """
+    Потоково извлекает данные из HTM, читая его блоками.
+
+    Записи отдаются по мере того, как в потоке закрывается очередной блок TD,
+    поэтому обработку можно начинать до конца входных данных. Результат
+    совпадает с parse_htm_content для того же содержимого.
+
+    Args:
+        stream: Бинарный поток с HTM в кодировке windows-1251 (например, sys.stdin.buffer)
+        chunk_size: Размер читаемого блока в байтах
+
+    Yields:
+        {"row": int, "column": int, "value": float}
+    """
+    decoder = codecs.getincrementaldecoder("windows-1251")()
+    td_open = re.compile(r"<TD>", re.IGNORECASE)
+    td_close = re.compile(r"</TD>", re.IGNORECASE)
+
+    buffer = ""
+    carry = ""  # Незавершённая HTML-сущность на границе блоков
+    in_block = False
+    scanned = 0  # До этой позиции буфера "</TD>" уже искали
+
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        text = carry + decoder.decode(chunk, final)
+
+        carry = ""
+        if not final:
+            amp = text.rfind("&", max(len(text) - 3, 0))
+            if amp != -1:
+                carry = text[amp:]
+                text = text[:amp]
+
+        # Заменяем HTML-сущности
+        buffer += text.replace("&lt;", "<").replace("&gt;", ">")
+
+        while True:
+            if not in_block:
+                match = td_open.search(buffer)
+                if not match:
+                    # Оставляем хвост, в котором может начинаться "<TD>"
+                    buffer = buffer[-3:]
+                    break
+                buffer = buffer[match.end() :]
+                in_block = True
+                scanned = 0
+
+            match = td_close.search(buffer, scanned)
+            if not match:
+                scanned = max(len(buffer) - 4, 0)
+                break
+
+            td_block = buffer[: match.start()]
+            buffer = buffer[match.end() :]
+            in_block = False
+
+            # Проверяем, содержит ли блок "Сравнение" (регистронезависимо)
+            if re.search(r"сравнение", td_block, re.IGNORECASE):
+                for entry in parse_block(td_block):
+                    yield entry
+
+        if final:
+            break
+
+
+def split_comparison_blocks(content: str) -> List[str]:
+    """
+    Находит блоки TD, содержащие "Сравнение".
+
+    Args:
+        content: Содержимое HTM файла
+
+    Returns:
+        Список содержимого блоков TD
+    """
+    # Заменяем HTML-сущности
+    content = content.replace("&lt;", "<").replace("&gt;", ">")
 
     # Находим все блоки TD
     td_blocks = re.findall(r"<TD>(.*?)</TD>", content, re.DOTALL | re.IGNORECASE)
 
-    for td_block in td_blocks:
-        # Проверяем, содержит ли блок "Сравнение" (регистронезависимо)
-        if not re.search(r"сравнение", td_block, re.IGNORECASE):
-            continue
+    # Оставляем блоки, содержащие "Сравнение" (регистронезависимо)
+    return [b for b in td_blocks if re.search(r"сравнение", b, re.IGNORECASE)]
 
-        # Извлекаем все параграфы
-        paragraphs = re.findall(
-            r"<P[^>]*>(.*?)</P>", td_block, re.DOTALL | re.IGNORECASE
-        )
 
-        # Обрабатываем параграфы
-        i = 0
-        while i < len(paragraphs):
-            p_text = paragraphs[i].strip()
+def parse_block(td_block: str, with_current: bool = False) -> List[Dict]:
+    """
+    Извлекает данные из одного блока TD секции "Сравнение".
 
-            # Пропускаем заголовки (содержат <B><I>)
-            if "<B>" in p_text or "<I>" in p_text:
-                i += 1
-                continue
+    Args:
+        td_block: Содержимое блока TD
+        with_current: Добавлять в записи левую часть сравнения (см. parse_htm)
 
-            # Ищем номер графы и строки в текущем параграфе
-            row, column = extract_row_column(p_text)
+    Returns:
+        Список словарей с данными (см. parse_htm)
+    """
+    results = []
 
-            if row is not None and column is not None:
-                # Следующий параграф должен содержать значение
-                if i + 1 < len(paragraphs):
-                    value_text = paragraphs[i + 1].strip()
-                    value = extract_value(value_text)
+    # Извлекаем все параграфы
+    paragraphs = re.findall(r"<P[^>]*>(.*?)</P>", td_block, re.DOTALL | re.IGNORECASE)
 
-                    if value is not None:
-                        results.append({"row": row, "column": column, "value": value})
-                    i += 2
-                    continue
+    # Обрабатываем параграфы
+    i = 0
+    while i < len(paragraphs):
+        p_text = paragraphs[i].strip()
 
+        # Пропускаем заголовки (содержат <B><I>)
+        if "<B>" in p_text or "<I>" in p_text:
             i += 1
+            continue
+
+        # Ищем номер графы и строки в текущем параграфе
+        row, column = extract_row_column(p_text)
+
+        if row is not None and column is not None:
+            # Следующий параграф должен содержать значение
+            if i + 1 < len(paragraphs):
+                value_text = paragraphs[i + 1].strip()
+                if with_current:
+                    current, value = extract_comparison(value_text)
+                else:
+                    value = extract_value(value_text)
+
+                if value is not None:
+                    entry = {"row": row, "column": column, "value": value}
+                    if with_current:
+                        entry["current"] = current
+                    results.append(entry)
+                i += 2
+                continue
+
+        i += 1
 
     return results
 
@@ -113,31 +231,77 @@ def extract_value(text: str) -> Optional[float]:
     Returns:
         Вычисленное значение или None
     """
+    text, match = match_comparison(text)
+    if not match:
+        return None
+
+    return evaluate_part(match.group(1))
+
+
+def extract_comparison(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Извлекает обе части сравнения из текста параграфа.
+
+    Левая часть - текущее значение в отчёте, правая - значение,
+    которое должно быть (его записывает apply_values).
+
+    Args:
+        text: Текст параграфа (например, "0 <> 37197")
+
+    Returns:
+        (current, value) - вычисленные левая и правая части;
+        (None, None) если правую часть извлечь не удалось
+    """
+    text, match = match_comparison(text)
+    if not match:
+        return None, None
+
+    value = evaluate_part(match.group(1))
+    if value is None:
+        return None, None
+
+    return evaluate_part(text[: match.start()]), value
+
+
+def match_comparison(text: str) -> tuple:
+    """
+    Находит символ <> в тексте параграфа.
+
+    Returns:
+        (текст без HTML тегов, совпадение или None);
+        группа 1 совпадения - правая часть
+    """
     # Удаляем HTML теги
     text = re.sub(r"<[^>]+>", "", text)
 
     # Ищем паттерн "... <> ..."
     # Символ <> может быть записан как <> или < >
-    match = re.search(r"<\s*>\s*(.+)$", text)
-    if not match:
-        return None
+    return text, re.search(r"<\s*>\s*(.+)$", text)
+
+
+def evaluate_part(part: str) -> Optional[float]:
+    """
+    Вычисляет одну часть сравнения.
 
-    right_part = match.group(1).strip()
+    Returns:
+        Вычисленное значение или None
+    """
+    part = part.strip()
 
-    # Если правая часть пустая
-    if not right_part:
+    # Если часть пустая
+    if not part:
         return None
 
     # Пытаемся вычислить выражение
     try:
         # Убираем возможные лишние символы в конце
-        right_part = re.sub(r"[^\d+\-*/().\s]", "", right_part)
-        right_part = right_part.strip()
+        part = re.sub(r"[^\d+\-*/().\s]", "", part)
+        part = part.strip()
 
-        if not right_part:
+        if not part:
             return None
 
-        result = evaluate(right_part)
+        result = evaluate(part)
         return result
     except (ValueError, ZeroDivisionError):
         return None
@@ -0,0 +1,358 @@
+"""
+Просмотр файла .01 в таблице без загрузки всего файла в память.
+Читаются только видимые строки по разреженному индексу смещений.
+"""
+
+import os
+import tkinter as tk
+from array import array
+from tkinter import ttk
+from typing import List, Optional, Set, Tuple
+
+# Число строк заголовка в файле .01
+HEADER_LINES = 2
+
+# Ширина столбцов таблицы в пикселях
+ROW_COLUMN_WIDTH = 50
+VALUE_COLUMN_WIDTH = 80
+
+# Сколько строк данных просматривать для определения числа граф
+COLUMN_PROBE_LINES = 1000
+
+
+class LineIndex:
+    """
+    Разреженный индекс смещений строк текстового файла.
+
+    Хранит смещение начала каждой step-й строки, поэтому для файла
+    в миллион строк занимает ~125 КБ. Чтение окна строк - один seek
+    и не более step лишних readline.
+
+    Файл открывается только на время чтения: результат можно перезаписать
+    (os.replace в save_file_01), пока открыт просмотр, в том числе на
+    Windows. Если размер или время изменения файла поменялись, индекс
+    перестраивается при следующем чтении.
+    """
+
+    def __init__(self, file_path: str, step: int = 64):
+        self.file_path = file_path
+        self.step = step
+        self.offsets = array("Q", [0])
+        self.line_count = 0
+        self._stamp = None
+        self.update()
+
+    @staticmethod
+    def _file_stamp(f) -> Tuple[int, int]:
+        st = os.fstat(f.fileno())
+        return st.st_size, st.st_mtime_ns
+
+    def _ensure_current(self, f) -> bool:
+        """Перестраивает индекс по открытому файлу, если он изменился."""
+        stamp = self._file_stamp(f)
+        if stamp == self._stamp:
+            return False
+        self._build(f)
+        self._stamp = stamp
+        return True
+
+    def update(self) -> bool:
+        """
+        Проверяет, не изменился ли файл, и при необходимости перестраивает индекс.
+
+        Returns:
+            True если индекс был перестроен
+        """
+        with open(self.file_path, "rb") as f:
+            return self._ensure_current(f)
+
+    def _build(self, f):
+        """Один проход по файлу блоками с подсчётом переводов строк."""
+        self.offsets = array("Q", [0])
+        base = 0
+        line = 0
+        last_byte = b""
+
+        f.seek(0)
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            newlines = chunk.count(b"\n")
+            next_mark = len(self.offsets) * self.step
+
+            if line + newlines < next_mark:
+                # В блоке нет строк, смещение которых нужно запомнить
+                line += newlines
+            else:
+                pos = -1
+                for _ in range(newlines):
+                    pos = chunk.find(b"\n", pos + 1)
+                    line += 1
+                    if line % self.step == 0:
+                        self.offsets.append(base + pos + 1)
+
+            base += len(chunk)
+            last_byte = chunk[-1:]
+
+        # Последняя строка без перевода строки тоже считается
+        if base and last_byte != b"\n":
+            line += 1
+        self.line_count = line
+
+    def read_lines(self, start: int, count: int) -> List[str]:
+        """
+        Читает count строк, начиная со строки start (с 0).
+
+        Returns:
+            Список строк без символов перевода строки
+        """
+        with open(self.file_path, "rb") as f:
+            # Файл мог быть заменён после последней проверки
+            self._ensure_current(f)
+
+            if start >= self.line_count or count <= 0:
+                return []
+
+            block = start // self.step
+            f.seek(self.offsets[block])
+            for _ in range(start - block * self.step):
+                f.readline()
+
+            lines = []
+            for _ in range(min(count, self.line_count - start)):
+                raw = f.readline()
+                if not raw:
+                    break
+                lines.append(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+            return lines
+
+
+class ResultPreview(ttk.Frame):
+    """
+    Таблица просмотра файла .01.
+
+    Treeview содержит только видимые строки: при прокрутке меняются
+    значения тех же элементов, а строки подгружаются из LineIndex.
+    Ячейки из changed_cells отмечаются звёздочкой, их строки - цветом.
+    """
+
+    def __init__(
+        self,
+        parent,
+        file_path: str,
+        changed_cells: Optional[Set[Tuple[int, int]]] = None,
+    ):
+        super().__init__(parent)
+
+        self.index = LineIndex(file_path)
+        self.changed_cells = changed_cells or set()
+        self.changed_rows = {row for row, _ in self.changed_cells}
+        self.row_count = max(self.index.line_count - HEADER_LINES, 0)
+        self.headers_text = tk.StringVar()
+        self.summary_text = tk.StringVar()
+        self.top = 0
+        self.visible = 0
+        self.column_count = 0
+        self.items = []
+
+        self.jump_row = tk.StringVar()
+        self.jump_column = tk.StringVar()
+
+        self.create_widgets()
+        self.update_labels()
+        self.set_columns(self.probe_column_count())
+
+    def create_widgets(self):
+        # Заголовки файла
+        ttk.Label(self, textvariable=self.headers_text, foreground="gray").pack(
+            fill=tk.X, pady=(0, 5)
+        )
+
+        # Переход к строке/графе
+        jump_frame = ttk.Frame(self)
+        jump_frame.pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Label(jump_frame, text="Строка:").pack(side=tk.LEFT)
+        row_entry = ttk.Entry(jump_frame, textvariable=self.jump_row, width=10)
+        row_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(jump_frame, text="Графа:").pack(side=tk.LEFT)
+        column_entry = ttk.Entry(jump_frame, textvariable=self.jump_column, width=6)
+        column_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Button(jump_frame, text="Перейти", command=self.jump).pack(side=tk.LEFT)
+        row_entry.bind("<Return>", lambda e: self.jump())
+        column_entry.bind("<Return>", lambda e: self.jump())
+
+        ttk.Label(jump_frame, textvariable=self.summary_text).pack(side=tk.RIGHT)
+
+        # Таблица со скроллбарами
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.tree = ttk.Treeview(table_frame, show="headings", selectmode="browse")
+        self.tree.tag_configure("changed", background="#fff3b0")
+
+        # Вертикальный скроллбар управляется вручную: он отражает
+        # положение окна во всём файле, а не в Treeview
+        self.vscroll = ttk.Scrollbar(
+            table_frame, orient=tk.VERTICAL, command=self.on_scroll
+        )
+        self.hscroll = ttk.Scrollbar(
+            table_frame, orient=tk.HORIZONTAL, command=self.tree.xview
+        )
+        self.tree.config(xscrollcommand=self.hscroll.set)
+
+        self.vscroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.hscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.top - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.top + 3))
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.top - self.visible))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.top + self.visible))
+        self.tree.bind("<Home>", lambda e: self.scroll_to(0))
+        self.tree.bind("<End>", lambda e: self.scroll_to(self.row_count))
+
+    def update_labels(self):
+        """Обновляет заголовки файла и счётчики."""
+        headers = self.index.read_lines(0, HEADER_LINES)
+        self.headers_text.set(" | ".join(headers))
+        self.summary_text.set(
+            f"Строк: {self.row_count}, изменено ячеек: {len(self.changed_cells)}"
+        )
+
+    def reload(self, changed_cells: Optional[Set[Tuple[int, int]]] = None):
+        """
+        Перечитывает файл после новой обработки.
+
+        Args:
+            changed_cells: Изменённые ячейки новой обработки
+        """
+        self.changed_cells = changed_cells or set()
+        self.changed_rows = {row for row, _ in self.changed_cells}
+        self.index.update()
+        self.row_count = max(self.index.line_count - HEADER_LINES, 0)
+        self.update_labels()
+        self.scroll_to(self.top)
+
+    def probe_column_count(self) -> int:
+        """Определяет число столбцов по первым строкам данных."""
+        lines = self.index.read_lines(HEADER_LINES, COLUMN_PROBE_LINES)
+        return max((len(line.split()) for line in lines), default=1)
+
+    def set_columns(self, count: int):
+        """Перенастраивает столбцы таблицы (столбец 0 - номер строки)."""
+        self.column_count = count
+        columns = [str(i) for i in range(count)]
+        self.tree.config(columns=columns)
+
+        for i, column in enumerate(columns):
+            if i == 0:
+                self.tree.heading(column, text="Стр.")
+                self.tree.column(column, width=ROW_COLUMN_WIDTH, stretch=False)
+            else:
+                self.tree.heading(column, text=f"г.{i}")
+                self.tree.column(
+                    column, width=VALUE_COLUMN_WIDTH, stretch=False, anchor=tk.E
+                )
+
+    def on_resize(self, event):
+        """Подгоняет число элементов Treeview под высоту окна."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Заголовок таблицы занимает примерно одну строку
+        visible = max(event.height // row_height - 1, 1)
+
+        if visible != self.visible:
+            self.visible = visible
+            while len(self.items) < visible:
+                self.items.append(self.tree.insert("", tk.END))
+            while len(self.items) > visible:
+                self.tree.delete(self.items.pop())
+            self.scroll_to(self.top)
+
+    def on_scroll(self, action, amount, unit=None):
+        """Обработчик вертикального скроллбара."""
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(amount) * self.row_count))
+        elif action == tk.SCROLL:
+            step = self.visible if unit == tk.PAGES else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def on_mousewheel(self, event):
+        # Windows/macOS: delta кратна 120 (Windows) или 1 (macOS)
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_to(self.top - delta * 3)
+        return "break"
+
+    def scroll_to(self, top: int):
+        """Показывает окно строк, начиная со строки данных top (с 0)."""
+        top = max(0, min(top, self.row_count - self.visible))
+        self.top = top
+        self.refresh()
+        return "break"
+
+    def refresh(self):
+        """Загружает видимое окно строк в Treeview."""
+        # Файл заменили извне (без reload) - подстраиваемся под новый размер
+        if self.index.update():
+            self.row_count = max(self.index.line_count - HEADER_LINES, 0)
+            self.top = max(0, min(self.top, self.row_count - self.visible))
+            self.update_labels()
+
+        lines = self.index.read_lines(HEADER_LINES + self.top, self.visible)
+        rows = [line.split() for line in lines]
+
+        widest = max((len(parts) for parts in rows), default=0)
+        if widest > self.column_count:
+            self.set_columns(widest)
+
+        for i, item in enumerate(self.items):
+            if i >= len(rows):
+                self.tree.item(item, values=(), tags=())
+                continue
+
+            row_num = self.top + i + 1
+            values = list(rows[i])
+            tags = ()
+            if row_num in self.changed_rows:
+                tags = ("changed",)
+                for col in range(1, len(values)):
+                    if (row_num, col) in self.changed_cells:
+                        values[col] = "*" + values[col]
+            self.tree.item(item, values=values, tags=tags)
+
+        if self.row_count:
+            first = self.top / self.row_count
+            last = min((self.top + self.visible) / self.row_count, 1.0)
+            self.vscroll.set(first, last)
+        else:
+            self.vscroll.set(0, 1)
+
+    def jump(self):
+        """Переходит к строке и/или графе из полей ввода."""
+        row_text = self.jump_row.get().strip()
+        column_text = self.jump_column.get().strip()
+
+        if row_text.isdigit():
+            row_num = int(row_text)
+            self.scroll_to(row_num - 1 - self.visible // 2)
+            position = row_num - 1 - self.top
+            if 0 <= position < len(self.items):
+                self.tree.selection_set(self.items[position])
+
+        if column_text.isdigit():
+            column = min(int(column_text), self.column_count - 1)
+            total = ROW_COLUMN_WIDTH + VALUE_COLUMN_WIDTH * (self.column_count - 1)
+            x = ROW_COLUMN_WIDTH + VALUE_COLUMN_WIDTH * (column - 1) if column else 0
+            self.tree.xview_moveto(x / total)
+
+
+if __name__ == "__main__":
+    import sys
+
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "dist/412_result.01"
+
+    root = tk.Tk()
+    root.title(f"Просмотр: {file_path}")
+    root.geometry("800x500")
+    ResultPreview(root, file_path).pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    root.mainloop()
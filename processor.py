@@ -5,7 +5,7 @@
 
 import os
 from parser import parse_htm
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple
 
 
 def load_file_01(file_path: str) -> Tuple[List[str], List[List[str]]]:
@@ -34,29 +34,98 @@ def load_file_01(file_path: str) -> Tuple[List[str], List[List[str]]]:
     return headers, data
 
 
+def _create_temp(file_path: str) -> Tuple[int, str]:
+    """
+    Создаёт временный файл рядом с file_path.
+
+    Файл создаётся с правами 0666, ядро само применяет umask процесса,
+    поэтому umask не читается и не меняется (os.umask действует на весь
+    процесс и небезопасен при записи из нескольких потоков).
+
+    Returns:
+        (fd, tmp_path) - дескриптор для записи и путь временного файла
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+    while True:
+        tmp_path = os.path.join(
+            directory, f"{os.path.basename(file_path)}.{os.urandom(4).hex()}.tmp"
+        )
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+
 def save_file_01(file_path: str, headers: List[str], data: List[List[str]]):
     """
     Сохраняет данные в файл .01.
 
+    Запись атомарная: данные пишутся во временный файл в той же папке,
+    сбрасываются на диск и только затем переименовываются в file_path.
+    При сбое на месте результата не остаётся недописанного файла.
+
     Args:
         file_path: Путь к файлу
         headers: Список строк заголовков
         data: Список строк данных
     """
-    with open(file_path, "w", encoding="utf-8") as f:
-        # Записываем заголовки
-        for header in headers:
-            if not header.endswith("\n"):
-                header += "\n"
-            f.write(header)
+    fd, tmp_path = _create_temp(file_path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            # Записываем заголовки
+            for header in headers:
+                if not header.endswith("\n"):
+                    header += "\n"
+                f.write(header)
+
+            # Записываем данные
+            for row in data:
+                f.write(" ".join(str(x) for x in row) + "\n")
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Существующий результат сохраняет свои права
+        try:
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        # Удаляем временный файл, исходный результат (если был) не тронут
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def format_value(value) -> str:
+    """Форматирует значение для записи в .01 (целое или с точкой)."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def check_column(entry: Dict) -> Optional[str]:
+    """
+    Проверяет номер графы записи.
 
-        # Записываем данные
-        for row in data:
-            f.write(" ".join(str(x) for x in row) + "\n")
+    Графа 0 - номер строки, отрицательный индекс задел бы чужую ячейку
+    с конца строки, поэтому такие записи не применяются.
+
+    Returns:
+        Текст ошибки или None, если графа допустима
+    """
+    if entry["column"] < 1:
+        return f"Графа {entry['column']} вне диапазона (строка {entry['row']})"
+    return None
 
 
 def apply_values(
-    data: List[List[str]], values: List[Dict]
+    data: List[List[str]],
+    values: List[Dict],
+    changed: Optional[Set[Tuple[int, int]]] = None,
 ) -> Tuple[int, int, List[str]]:
     """
     Применяет значения из HTM к данным файла .01.
@@ -64,6 +133,8 @@ def apply_values(
     Args:
         data: Данные из файла .01 (список строк, каждая строка - список значений)
         values: Список значений из HTM [{"row": int, "column": int, "value": float}, ...]
+        changed: Если передано, сюда добавляются (row, column) ячеек,
+            значение которых изменилось
 
     Returns:
         (applied_count, skipped_count, errors) - статистика применения
@@ -80,7 +151,13 @@ def apply_values(
         # Индекс строки в data (row_num - 1, т.к. в файле строки начинаются с 1)
         row_idx = row_num - 1
 
-        # Проверяем границы
+        # Проверяем границы (графу - первой, как в fill_stream)
+        column_error = check_column(entry)
+        if column_error:
+            errors.append(column_error)
+            skipped += 1
+            continue
+
         if row_idx < 0 or row_idx >= len(data):
             errors.append(f"Строка {row_num} вне диапазона (макс: {len(data)})")
             skipped += 1
@@ -93,19 +170,80 @@ def apply_values(
         while len(data[row_idx]) <= col_idx:
             data[row_idx].append("0")
 
-        # Форматируем значение (целое или с точкой)
-        if isinstance(value, float) and value.is_integer():
-            value_str = str(int(value))
-        else:
-            value_str = str(value)
+        value_str = format_value(value)
 
         # Применяем значение
+        if changed is not None and data[row_idx][col_idx] != value_str:
+            changed.add((row_num, col_num))
         data[row_idx][col_idx] = value_str
         applied += 1
 
     return applied, skipped, errors
 
 
+def fill_stream(
+    template_lines: Iterable[str], values: Iterable[Dict], out: TextIO
+) -> Tuple[int, int, List[str]]:
+    """
+    Заполняет шаблон .01 значениями, записывая результат построчно в out.
+
+    Шаблон не загружается целиком: в памяти держатся только значения.
+    Результат совпадает с load_file_01 + apply_values + save_file_01.
+
+    Args:
+        template_lines: Строки шаблона .01 (например, открытый файл)
+        values: Значения [{"row": int, "column": int, "value": float}, ...]
+        out: Текстовый поток для результата (например, sys.stdout)
+
+    Returns:
+        (applied_count, skipped_count, errors) - статистика применения
+    """
+    # Значения по строкам {строка: [(графа, значение), ...]} в порядке поступления
+    applied = 0
+    skipped = 0
+    errors = []
+
+    by_row = {}
+    for entry in values:
+        column_error = check_column(entry)
+        if column_error:
+            errors.append(column_error)
+            skipped += 1
+            continue
+        by_row.setdefault(entry["row"], []).append(
+            (entry["column"], format_value(entry["value"]))
+        )
+    data_count = 0
+
+    for line_num, line in enumerate(template_lines):
+        # Первые 2 строки - заголовки
+        if line_num < 2:
+            if not line.endswith("\n"):
+                line += "\n"
+            out.write(line)
+            continue
+
+        data_count += 1
+        parts = line.strip().split()
+
+        for col_idx, value_str in by_row.pop(data_count, ()):
+            # Расширяем строку если нужно
+            while len(parts) <= col_idx:
+                parts.append("0")
+            parts[col_idx] = value_str
+            applied += 1
+
+        out.write(" ".join(parts) + "\n")
+
+    # Строки, которых нет в шаблоне
+    for row_num in sorted(by_row):
+        for _ in by_row[row_num]:
+            errors.append(f"Строка {row_num} вне диапазона (макс: {data_count})")
+            skipped += 1
+
+    return applied, skipped, errors
+
+
 def process(htm_path: str, file_01_path: str, output_path: str = None) -> Dict:
     """
     Основная функция обработки.
@@ -122,6 +260,7 @@ def process(htm_path: str, file_01_path: str, output_path: str = None) -> Dict:
             "applied_count": int,
             "skipped_count": int,
             "output_path": str,
+            "changed_cells": set,
             "errors": list
         }
     """
@@ -137,7 +276,8 @@ def process(htm_path: str, file_01_path: str, output_path: str = None) -> Dict:
     headers, data = load_file_01(file_01_path)
 
     # Применяем значения
-    applied, skipped, errors = apply_values(data, values)
+    changed = set()
+    applied, skipped, errors = apply_values(data, values, changed)
 
     # Сохраняем результат
     save_file_01(output_path, headers, data)
@@ -147,6 +287,7 @@ def process(htm_path: str, file_01_path: str, output_path: str = None) -> Dict:
         "applied_count": applied,
         "skipped_count": skipped,
         "output_path": output_path,
+        "changed_cells": changed,
         "errors": errors,
     }
 
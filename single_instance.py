@@ -0,0 +1,282 @@
+"""
+Единственный экземпляр приложения.
+
+Первый запуск слушает канал пользователя (именованный канал на Windows,
+сокет AF_UNIX в личной папке на Linux/macOS). Последующие запуски передают
+ему пути файлов и сразу завершаются, не создавая окна.
+
+Обе стороны проверяют друг друга ключом из файла, который может прочитать
+только пользователь (multiprocessing.connection, authkey). Если проверка
+не прошла или экземпляр не ответил, запуск открывает собственное окно.
+"""
+
+import getpass
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+from multiprocessing.connection import (
+    Client,
+    Listener,
+    answer_challenge,
+    deliver_challenge,
+)
+from typing import List, Tuple
+
+APP_ID = "HTM_Processor"
+
+# Размер ключа канала, байт
+AUTHKEY_SIZE = 32
+
+# Максимальный размер сообщения со списком файлов
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+
+def current_user() -> str:
+    """Имя текущего пользователя (пустая строка, если не удалось определить)."""
+    try:
+        return getpass.getuser()
+    except Exception:
+        return ""
+
+
+def state_dir() -> str:
+    """
+    Личная папка пользователя для сокета и ключа.
+
+    На Linux/macOS папка создаётся с правами 0700; если она принадлежит
+    другому пользователю, канал не используется.
+
+    Raises:
+        OSError: Если папку нельзя создать или она чужая
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        path = os.path.join(base, APP_ID)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    path = os.path.join(base, APP_ID.lower())
+    os.makedirs(path, mode=0o700, exist_ok=True)
+
+    st = os.stat(path)
+    if st.st_uid != os.getuid():
+        raise OSError(f"Папка {path} принадлежит другому пользователю")
+    if st.st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+
+def load_authkey() -> bytes:
+    """
+    Читает ключ канала, при первом запуске создаёт его.
+
+    Файл создаётся с правами 0600 (на Windows папка LOCALAPPDATA
+    доступна только пользователю).
+
+    Raises:
+        OSError: Если ключ нельзя прочитать или создать либо файл
+            доступен другим пользователям
+    """
+    path = os.path.join(state_dir(), "authkey")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+    try:
+        fd = os.open(path, flags, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(AUTHKEY_SIZE))
+
+    with open(path, "rb") as f:
+        if sys.platform != "win32":
+            st = os.fstat(f.fileno())
+            if st.st_uid != os.getuid() or st.st_mode & 0o077:
+                raise OSError(f"Ключ {path} доступен другим пользователям")
+        key = f.read()
+
+    # Другой запуск мог ещё не дописать ключ
+    if len(key) != AUTHKEY_SIZE:
+        raise OSError(f"Ключ {path} повреждён или ещё не записан")
+    return key
+
+
+def instance_address() -> Tuple[str, str]:
+    """
+    Адрес канала экземпляра - свой для каждого пользователя машины.
+
+    Returns:
+        (address, family) для Listener/Client
+    """
+    if sys.platform == "win32":
+        user = hashlib.sha256(current_user().encode("utf-8")).hexdigest()[:16]
+        return rf"\\.\pipe\{APP_ID}-{user}", "AF_PIPE"
+    return os.path.join(state_dir(), "instance.sock"), "AF_UNIX"
+
+
+def _run_with_timeout(func, timeout: float):
+    """
+    Выполняет func в фоновом потоке и ждёт не дольше timeout.
+
+    У Client и Listener.accept нет таймаута: зависший собеседник не должен
+    задерживать запуск программы.
+
+    Returns:
+        Результат func или None при ошибке или таймауте
+    """
+    result = []
+
+    def target():
+        try:
+            result.append(func())
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return result[0] if result else None
+
+
+def send_to_running_instance(paths: List[str], timeout: float = 2.0) -> bool:
+    """
+    Передаёт пути файлов уже запущенному экземпляру.
+
+    Args:
+        paths: Пути к файлам (могут быть пустыми - тогда экземпляр
+            просто выводит окно на передний план)
+        timeout: Время ожидания соединения и ответа, секунды
+
+    Returns:
+        True если экземпляр принял файлы, False если его нет или он
+        не прошёл проверку ключа
+    """
+    try:
+        address, family = instance_address()
+        authkey = load_authkey()
+    except OSError:
+        return False
+
+    payload = json.dumps([os.path.abspath(p) for p in paths]).encode("utf-8")
+
+    def exchange() -> bool:
+        with Client(address, family, authkey=authkey) as conn:
+            conn.send_bytes(payload)
+            return conn.recv_bytes(16) == b"OK"
+
+    return _run_with_timeout(exchange, timeout) is True
+
+
+class InstanceServer:
+    """
+    Сервер резидентного экземпляра.
+
+    Принимает пути от последующих запусков в фоновом потоке и кладёт
+    их списками в очередь queue, которую GUI опрашивает через after().
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self._listener = None
+        self._address = None
+        self._authkey = None
+        self._thread = None
+        self._closed = threading.Event()
+
+    def _listen(self) -> Listener:
+        address, family = self._address
+        try:
+            return Listener(address, family)
+        except OSError:
+            if family != "AF_UNIX" or not os.path.exists(address):
+                raise
+
+        # Сокет остался от завершившегося аварийно экземпляра: раз к нему
+        # не удалось подключиться (см. main), удаляем его и пробуем снова
+        try:
+            Client(address, family).close()
+        except ConnectionRefusedError:
+            os.remove(address)
+            return Listener(address, family)
+        raise OSError(f"Канал {address} занят")
+
+    def start(self) -> bool:
+        """
+        Начинает слушать канал экземпляра.
+
+        Returns:
+            False если канал занят (например, экземпляр запустился
+            одновременно с нами) или недоступен - тогда работаем
+            как обычно, без сервера
+        """
+        try:
+            self._address = instance_address()
+            self._authkey = load_authkey()
+            self._listener = self._listen()
+        except OSError:
+            return False
+
+        self._thread = threading.Thread(
+            target=self._serve, args=(self._listener,), daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _serve(self, listener: Listener):
+        # _closed проверяется после accept(): подключение из close()
+        # должно застать поток в accept(), иначе оно ждало бы до таймаута
+        while True:
+            try:
+                # Listener создан без authkey: ключ проверяется ниже, чтобы
+                # ошибку проверки не путать с закрытием канала
+                conn = listener.accept()
+            except OSError:
+                # Канал закрыт в close()
+                return
+
+            with conn:
+                try:
+                    # Проверка в обе стороны, как в Listener.accept с authkey
+                    deliver_challenge(conn, self._authkey)
+                    answer_challenge(conn, self._authkey)
+                except Exception:
+                    # Собеседник не знает ключа или отключился
+                    continue
+
+                # После close() файлы не принимаем: без ответа OK
+                # отправитель откроет собственное окно
+                if self._closed.is_set():
+                    return
+                try:
+                    if not conn.poll(2.0):
+                        continue
+                    paths = json.loads(
+                        conn.recv_bytes(MAX_MESSAGE_SIZE).decode("utf-8")
+                    )
+                    if not isinstance(paths, list):
+                        continue
+                    self.queue.put([str(p) for p in paths])
+                    conn.send_bytes(b"OK")
+                except (OSError, EOFError, ValueError):
+                    continue
+
+    def close(self):
+        self._closed.set()
+        if self._listener is None:
+            return
+
+        listener, self._listener = self._listener, None
+        # Закрытие не прерывает ожидающий accept(): будим его своим
+        # подключением, поток увидит _closed и завершится
+        address, family = self._address
+        authkey = self._authkey
+        _run_with_timeout(
+            lambda: Client(address, family, authkey=authkey).close(), 1.0
+        )
+        listener.close()
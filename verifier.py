@@ -0,0 +1,178 @@
+"""
+Проверка файла .01 по отчёту HTM без записи результата.
+
+Файл .01 читается построчно, в памяти держатся только ожидаемые значения
+из HTM. На выходе - список расхождений (строка, графа, ожидается, фактически,
+значение в отчёте).
+"""
+
+import math
+from parser import parse_htm
+from typing import Dict, List, Optional
+
+from processor import format_value
+
+# Число строк заголовка в файле .01
+HEADER_LINES = 2
+
+
+def values_equal(actual: Optional[str], expected: float) -> bool:
+    """Сравнивает значение из .01 с ожидаемым числом."""
+    if actual is None:
+        return False
+    try:
+        return math.isclose(float(actual), expected, rel_tol=1e-9, abs_tol=1e-9)
+    except ValueError:
+        return False
+
+
+def verify(htm_path: str, file_01_path: str) -> Dict:
+    """
+    Сверяет значения файла .01 с правыми частями сравнений в HTM.
+
+    Args:
+        htm_path: Путь к HTM файлу
+        file_01_path: Путь к файлу .01
+
+    Returns:
+        Словарь со статистикой:
+        {
+            "parsed_count": int,
+            "checked_count": int,
+            "mismatch_count": int,
+            "mismatches": [
+                {"row": int, "column": int, "expected": float,
+                 "actual": str или None, "current": float или None}, ...
+            ]
+        }
+        где current - левая часть сравнения в отчёте
+    """
+    # Ожидаемые значения {строка: {графа: запись}}, повторная ячейка
+    # перезаписывается, как в apply_values
+    entries = parse_htm(htm_path, with_current=True)
+    expected = {}
+    for entry in entries:
+        expected.setdefault(entry["row"], {})[entry["column"]] = entry
+
+    checked = 0
+    mismatches = []
+
+    def compare(row_num: int, cells: Dict, parts: List[str]):
+        nonlocal checked
+        for col_num in sorted(cells):
+            entry = cells[col_num]
+            actual = parts[col_num] if 0 <= col_num < len(parts) else None
+            checked += 1
+            if not values_equal(actual, entry["value"]):
+                mismatches.append(
+                    {
+                        "row": row_num,
+                        "column": col_num,
+                        "expected": entry["value"],
+                        "actual": actual,
+                        "current": entry["current"],
+                    }
+                )
+
+    with open(file_01_path, "r", encoding="utf-8") as f:
+        for line_num, line in enumerate(f):
+            if not expected:
+                # Все ожидаемые строки проверены - дальше читать не нужно
+                break
+            if line_num < HEADER_LINES:
+                continue
+
+            # Номер строки - позиция в данных, как в apply_values
+            row_num = line_num - HEADER_LINES + 1
+            cells = expected.pop(row_num, None)
+            if cells:
+                compare(row_num, cells, line.split())
+
+    # Строки, которых нет в файле
+    for row_num in sorted(expected):
+        compare(row_num, expected[row_num], [])
+
+    return {
+        "parsed_count": len(entries),
+        "checked_count": checked,
+        "mismatch_count": len(mismatches),
+        "mismatches": mismatches,
+    }
+
+
+def format_mismatch(mismatch: Dict) -> str:
+    """
+    Строка отчёта через табуляцию: строка, графа, ожидается, фактически,
+    значение в отчёте (левая часть сравнения). Совпадение последних двух
+    означает, что ячейка не исправлена после формирования отчёта.
+    """
+    actual = mismatch["actual"] if mismatch["actual"] is not None else "-"
+    current = mismatch["current"]
+    return "\t".join(
+        [
+            str(mismatch["row"]),
+            str(mismatch["column"]),
+            format_value(mismatch["expected"]),
+            actual,
+            format_value(current) if current is not None else "-",
+        ]
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from batch import load_jobs
+
+    arg_parser = argparse.ArgumentParser(
+        description="Проверка .01 по HTM без записи результата. "
+        "Код выхода: 0 - совпадает, 1 - есть расхождения, 2 - ошибка"
+    )
+    arg_parser.add_argument("htm", nargs="?", help="Файл HTM")
+    arg_parser.add_argument("file_01", nargs="?", help="Файл .01")
+    arg_parser.add_argument(
+        "--jobs", help="Файл со списком пар (htm;01), как для batch.py"
+    )
+    arg_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Не выводить расхождения"
+    )
+    args = arg_parser.parse_args()
+
+    try:
+        if args.jobs:
+            pairs = [(htm, file_01) for htm, file_01, _ in load_jobs(args.jobs)]
+        elif args.htm and args.file_01:
+            pairs = [(args.htm, args.file_01)]
+        else:
+            arg_parser.error("укажите HTM и .01 или --jobs")
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    total_mismatches = 0
+    failed = 0
+
+    for htm_path, file_01_path in pairs:
+        try:
+            result = verify(htm_path, file_01_path)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка: {file_01_path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+
+        total_mismatches += result["mismatch_count"]
+        if not args.quiet:
+            prefix = f"{file_01_path}\t" if len(pairs) > 1 else ""
+            for mismatch in result["mismatches"]:
+                print(prefix + format_mismatch(mismatch))
+
+    print(
+        f"Проверено пар: {len(pairs) - failed}, расхождений: {total_mismatches}, "
+        f"ошибок: {failed}",
+        file=sys.stderr,
+    )
+
+    if failed:
+        sys.exit(2)
+    sys.exit(1 if total_mismatches else 0)